@@ -1,7 +1,9 @@
-import math
-import copy
+import os
+import sys
+import mmap
 import base64
 import struct
+import tempfile
 from loguru import logger
 from prettytable import PrettyTable
 
@@ -10,50 +12,130 @@ from .page.item_id_data import LpFlags
 from .page.page_header_data import PageHeaderData, PdFlags
 
 from .item.t_infomask import HeapT_InfomaskFlags, HeapT_Infomask2Flags
-from .item.heap_tuple_header_data import HeapTupleHeaderData
 
-from pg_types import PARSEABLE_TYPES, Varlena_1B, Varlena_4B, DataType, \
-      DataTypeRaw
+from pg_types import Varlena_1B, Varlena_4B, DataType, DataTypeRaw
+
+# unpacker for the pd_pagesize_version page header field, used to walk
+# page boundaries without parsing the pages themselves
+_PAGE_SIZE_STRUCT = struct.Struct('<H')
+
+# pd_lower of a page holding a single line pointer: the fixed header
+# followed by one 4 byte ItemIdData
+_PD_LOWER_INITIAL = PageHeaderData._FIELD_SIZE + 4
+
+
+class LazyPageList:
+    # list-like container that parses a Page on first access; most CLI
+    # modes touch a single page, so eagerly parsing every page up front
+    # is wasted work on large filenodes
+    def __init__(self, filenode_bytes, page_offsets):
+        self._filenode_bytes = filenode_bytes
+        self._page_offsets = page_offsets
+        self._pages = dict()
+        self._extra = list()
+
+    def __len__(self):
+        return len(self._page_offsets) + len(self._extra)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('page index out of range')
+        # pages appended during updates live in self._extra
+        if index >= len(self._page_offsets):
+            return self._extra[index - len(self._page_offsets)]
+        # parse the page on first access and cache the object, so that
+        # edits through the cached instance stick
+        page = self._pages.get(index)
+        if page is None:
+            page = Page(self._filenode_bytes, self._page_offsets[index])
+            self._pages[index] = page
+        return page
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, page):
+        self._extra.append(page)
 
 
 class Filenode:
     def __init__(self, filenode_path, datatype=None):
         self.datatype = datatype if datatype is not None else DataTypeRaw()
 
+        self._mmap = None
         with open(filenode_path, 'rb') as f:
-            filenode_bytes = f.read()
-
-        self.pages = list()
+            try:
+                # map the filenode instead of reading it into memory;
+                # the OS only pages in the parts actually touched, so
+                # inspecting a couple of items in a multi-GB filenode
+                # no longer loads the whole file
+                self._mmap = mmap.mmap(f.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+                filenode_bytes = memoryview(self._mmap)
+            except ValueError:
+                # empty files cannot be mapped
+                filenode_bytes = memoryview(f.read())
+        self._filenode_bytes = filenode_bytes
+
+        self._page_offsets = self._scan_page_offsets(filenode_bytes)
+        self.pages = LazyPageList(filenode_bytes, self._page_offsets)
+        # ids of pages modified since parsing; unmodified pages can be
+        # written back from the original buffer without re-serializing
+        self._dirty_pages = set()
+
+    def _scan_page_offsets(self, filenode_bytes):
+        filenode_size = len(filenode_bytes)
+        if not filenode_size:
+            return list()
+        # pages are uniformly sized within a relation, so the page
+        # boundaries normally follow a fixed stride derived from the
+        # first header
+        page_size = _PAGE_SIZE_STRUCT.unpack_from(
+            filenode_bytes, 18)[0] & 0xFF00
+        if page_size and filenode_size % page_size == 0:
+            return range(0, filenode_size, page_size)
+        # inconsistent page size; fall back to walking the headers one
+        # by one
+        page_offsets = list()
         page_offset = 0
-        while page_offset < len(filenode_bytes):
-            # parse header bytes of new page
-            page = Page(filenode_bytes, page_offset)
-            self.pages.append(page)
-            page_offset += page.header.length
+        while page_offset < filenode_size:
+            page_offsets.append(page_offset)
+            page_offset += _PAGE_SIZE_STRUCT.unpack_from(
+                filenode_bytes, page_offset + 18)[0] & 0xFF00
+        return page_offsets
+
+    def close(self):
+        # release the buffer view and the underlying mapping; lazily
+        # parsed pages and items are unusable afterwards
+        self._filenode_bytes.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _apply_item_nullmap_to_datatype_from_header(self, item_header):
-        item_datatype = list()
         # if there is a nullmap present, process it
-        if HeapT_InfomaskFlags.HEAP_HASNULL in HeapT_InfomaskFlags(
-                item_header.t_infomask.flags
-        ):
-            # copy of nullmap
+        # test the bits by shift-and-mask off the immutable nullmap
+        # int; a set bit marks the field as present
+        if item_header.has_null:
             _nullmap = item_header.nullmap
-            for field_def in self.datatype.field_defs:
-                # check if row has null values
-                field_present = _nullmap & 0x1
-                _nullmap >>= 1
-
-                item_datatype.append(
-                    field_def | {'is_null': not field_present}
-                )
+            return [
+                field_def | {'is_null': not (_nullmap >> i) & 0x1}
+                for i, field_def in enumerate(self.datatype.field_defs)
+            ]
         # else just set all fields to not null
-        else:
-            for field_def in self.datatype.field_defs:
-                item_datatype.append(
-                    field_def | {'is_null': False}
-                )
-        return item_datatype
+        return [
+            field_def | {'is_null': False}
+            for field_def in self.datatype.field_defs
+        ]
 
     def _apply_item_nullmap_to_datatype_from_data(self, item_data):
         item_datatype = list()
@@ -66,29 +148,54 @@ class Filenode:
         return item_datatype
 
     def _deserialize_data_datatype(self, item_data, item_header):
+        # fast path: if the schema allows decoding the whole row with a
+        # single precompiled struct and the item carries no nullmap,
+        # skip the per-field loop entirely
+        # items shorter than the full row (e.g. written before trailing
+        # columns were added) fall through to the per-field loop, which
+        # degrades gracefully past the end of the data
+        _fast_struct = self.datatype._fast_struct
+        if _fast_struct is not None and not item_header.has_null \
+                and len(item_data) >= _fast_struct.size:
+            return [{
+                'name': field_def['name'],
+                'type': field_def['type'],
+                'value': value,
+                'is_null': False
+            } for field_def, value in zip(
+                self.datatype.field_defs,
+                _fast_struct.unpack_from(item_data)
+            )]
+
         deserialized_data = list()
         offset = 0
 
         item_datatype = self._apply_item_nullmap_to_datatype_from_header(
             item_header)
 
+        # hoist repeated attribute walks out of the per-field loop
+        _get_next_non_null_field = self.datatype._get_next_non_null_field
+        _field_no_padding = self.datatype._field_no_padding
+
         for i in range(len(item_datatype)):
             field_def = item_datatype[i]
+            field_length = field_def['length']
             # handle null fields
             if field_def['is_null']:
                 length = 0
                 value = b''
 
             # handle fixed length fields
-            elif field_def['length'] > 0:
-                length = field_def['length']
+            elif field_length > 0:
+                length = field_length
                 value = self._deserialize_fixed_len_field(
                     field_def,
-                    item_data[offset:offset+length]
+                    item_data,
+                    offset
                 )
 
             # handle varlena fields, e.g. text, varchar
-            elif field_def['length'] == -1:
+            elif field_length == -1:
                 varlena_field = self._deserialize_varlena_field(
                     item_data[offset:]
                 )
@@ -106,16 +213,16 @@ class Filenode:
             # data to match the 4 byte alignment
 
             # get next non null column
-            next_field_def = self.datatype._get_next_non_null_field(
+            next_field_def = _get_next_non_null_field(
                 item_datatype[i+1:])
 
             if next_field_def:
                 if all([
-                    self.datatype._field_no_padding(field_def),
-                    not self.datatype._field_no_padding(next_field_def)
+                    _field_no_padding(field_def),
+                    not _field_no_padding(next_field_def)
                 ]):
-                    length += math.ceil((offset+length)/4) * \
-                        4 - (offset+length)
+                    # pad up to the 4 byte boundary with bit math
+                    length += -(offset+length) & 3
 
             # append the unserialized field to the output
             deserialized_data.append({
@@ -146,16 +253,16 @@ class Filenode:
         except Exception:
             logger.exception('An exception occured during deserialization')
 
-    def _deserialize_fixed_len_field(self, field_def, field_bytes):
-        if field_bytes:
-            if field_def['type'] in PARSEABLE_TYPES:
-                return struct.unpack(
-                    f'<{field_def["alignment"]}',
-                    field_bytes
-                )[0]
+    def _deserialize_fixed_len_field(self, field_def, item_data, offset):
+        if offset < len(item_data):
+            field_struct = field_def['_struct']
+            if field_struct is not None:
+                # unpack_from avoids slicing a fresh bytes object per
+                # field; the struct is precompiled at schema-bind time
+                return field_struct.unpack_from(item_data, offset)[0]
         # not supported fixed length type or empty data
         # just return the byteslice back
-        return field_bytes
+        return item_data[offset:offset+field_def['length']]
 
     def _deserialize_varlena_field(self, field_bytes):
         # varlena struct has a length field at the start
@@ -191,7 +298,7 @@ class Filenode:
             # if datatype is present, try to serialize the data into bytes
             serialized_data = b''
             # avoid modifying original item header during serialization
-            _item_header = copy.deepcopy(item_header)
+            _item_header = item_header.clone()
 
             item_datatype = self._apply_item_nullmap_to_datatype_from_data(
                 item_data)
@@ -237,8 +344,7 @@ class Filenode:
                             next_field_def),
                     ]):
                         serialized_data += bytes(
-                            math.ceil(len(serialized_data)/4)*4 -
-                            len(serialized_data)
+                            -len(serialized_data) & 3
                         )
 
             # set nullmap to 0 (default case)
@@ -276,11 +382,8 @@ class Filenode:
 
     def _serialize_fixed_len_field(self, field_def, field_value):
         # check if the field type is supported by the parser
-        if field_def['type'] in PARSEABLE_TYPES:
-            return struct.pack(
-                f'<{field_def["alignment"]}',
-                int(field_value)
-            )
+        if field_def['_struct'] is not None:
+            return field_def['_struct'].pack(int(field_value))
         # else we would need to set the raw byte value of the field from the
         # user input
         try:
@@ -301,7 +404,7 @@ class Filenode:
         # length
         if len(field_value) < Varlena_1B._VA_MAX_DATA_SIZE:
             varlena_field = Varlena_1B()
-        elif len(field_value) < Varlena_1B._VA_MAX_DATA_SIZE:
+        elif len(field_value) < Varlena_4B._VA_MAX_DATA_SIZE:
             varlena_field = Varlena_4B()
         else:
             raise ValueError('Data length is greater than the \
@@ -320,15 +423,17 @@ class Filenode:
 
         page_table.field_names = ['item_no'] + page_field_names
 
-        for i in range(len(items_to_print)):
+        for i, item_fields in enumerate(items_to_print):
             table_row = [i]
             # if datatype exists, parse item fields and add them to the row
             table_row += ['NULL' if x['is_null'] else x['value']
-                          for x in items_to_print[i]]
+                          for x in item_fields]
             # else, add entire raw item to the row
             page_table.add_row(table_row)
 
-        print(page_table)
+        # render the whole table once and emit it with a single write
+        # instead of going through line-buffered print
+        sys.stdout.write(page_table.get_string() + '\n')
 
     def list_pages(self):
         for i in range(len(self.pages)):
@@ -337,14 +442,15 @@ class Filenode:
     def list_page(self, page_id):
         try:
             logger.success(f'Page {page_id}:')
-            items_to_print = list()
+            # bind the lookups once per page instead of re-resolving
+            # them on every item of the inner loop
+            items = self.pages[page_id].items
+            _deserialize_data = self._deserialize_data
 
-            for j in range(len(self.pages[page_id].items)):
-                item = self.pages[page_id].items[j]
-                # deserialize data if datatype is present
-                items_to_print.append(
-                    self._deserialize_data(item.data, item.header)
-                )
+            # deserialize data if datatype is present
+            items_to_print = [
+                _deserialize_data(item.data, item.header) for item in items
+            ]
 
             self.print_data(items_to_print)
         except IndexError:
@@ -410,22 +516,29 @@ class Filenode:
 
     def _update_item_inline(self, page_id, item_id, new_item_data,
                             new_item_header):
+        self._dirty_pages.add(page_id)
+        page = self.pages[page_id]
         # set new item length in corresponding ItemId object
-        self.pages[page_id].item_ids[item_id].lp_len = len(new_item_data) + \
-            HeapTupleHeaderData._FIELD_SIZE + \
-            self.pages[page_id].items[item_id].header.nullmap_byte_size
+        page.item_ids[item_id].lp_len = len(new_item_data) + \
+            page.items[item_id].header.total_header_size
         # set new header in the item object
-        self.pages[page_id].items[item_id].header = new_item_header
+        page.items[item_id].header = new_item_header
         # set new data in the item object
-        self.pages[page_id].items[item_id].data = new_item_data
+        page.items[item_id].data = new_item_data
 
     def _update_item_new_item(self, page_id, item_id, new_item_data,
                               new_item_header):
-        target_item = self.pages[page_id].items[item_id]
-        target_item_id = self.pages[page_id].item_ids[item_id]
-        # make deep copies of the target Item and ItemId objects
-        new_item = copy.deepcopy(target_item)
-        new_item_id = copy.deepcopy(self.pages[page_id].item_ids[item_id])
+        # the source page is modified even when the new item ends up in
+        # a new page: the old item gets marked as stale
+        self._dirty_pages.add(page_id)
+        page = self.pages[page_id]
+        target_item = page.items[item_id]
+        target_item_id = page.item_ids[item_id]
+        # make copies of the target Item and ItemId objects
+        # the purpose-built clone methods are much cheaper than
+        # copy.deepcopy, which traverses the object graph generically
+        new_item = target_item.clone()
+        new_item_id = target_item_id.clone()
 
         # set new data in the item object
         new_item.data = new_item_data
@@ -464,55 +577,80 @@ class Filenode:
         # there is enough page for the insertion, and compute all necessary
         # offsets
 
-        # calculate the alligned byte length of the new item
-        new_item_byte_length = math.ceil(len(new_item.to_bytes()) / 8) * 8
+        # calculate the alligned byte length of the new item without
+        # serializing it; the length drives both the placement check
+        # and the offsets below
+        new_item_byte_length = (new_item.byte_length() + 7) & ~7
         # set byte length in the corresponding ItemIdData object
         new_item_id.lp_len = new_item_byte_length
 
-        if new_item_byte_length > (self.pages[page_id].header.pd_upper -
-                                   self.pages[page_id].header.pd_lower):
+        if new_item_byte_length > (page.header.pd_upper -
+                                   page.header.pd_lower):
             # create new page with item in it
-            self._update_item_new_page(page_id, new_item_id, new_item)
+            self._update_item_new_page(page_id, new_item_id, new_item,
+                                       new_item_byte_length)
         else:
             # adjust empty space offsets in page header
             # shift pd_lower up 4 bytes due to the new ItemId object
             # being added
-            self.pages[page_id].header.pd_lower += 4
+            page.header.pd_lower += 4
             # shift pd_upper down by the length of the new item
-            self.pages[page_id].header.pd_upper -= new_item_byte_length
+            page.header.pd_upper -= new_item_byte_length
             # adjust offset in the ItemIdData object
             # new item will start at the pd_upper now
-            new_item_id.lp_off = self.pages[page_id].header.pd_upper
+            new_item_id.lp_off = page.header.pd_upper
             # append new data to the list
-            self.pages[page_id].item_ids.append(new_item_id)
-            self.pages[page_id].items.append(new_item)
-
-    def _update_item_new_page(self, page_id, new_item_id, new_item):
-        source_page = self.pages[page_id]
-        # make copy of the target page
-        new_page = copy.deepcopy(source_page)
+            page.item_ids.append(new_item_id)
+            page.items.append(new_item)
+
+    def _update_item_new_page(self, page_id, new_item_id, new_item,
+                              new_item_byte_length):
+        # the new page only carries the single new item, so instead of
+        # deep-copying the whole source page just to throw its contents
+        # away, clone the header and assemble the page from parts
+        new_header = self.pages[page_id].header.clone()
         # unset any undesired flags
-        new_page.header.flags = PdFlags.PD_UNDEFINED
+        # note: this used to assign to a non-existing 'flags' attribute
+        # and silently had no effect
+        new_header.pd_flags = PdFlags.PD_UNDEFINED.value
 
-        # calculate byte length of the new item and set pd_lower and pd_upper
-        # accordingly
-        new_item_byte_length = math.ceil(len(new_item.to_bytes()) / 8) * 8
-        new_page.header.pd_lower = PageHeaderData._FIELD_SIZE + 4
-        new_page.header.pd_upper = new_page.header.length - \
-            new_item_byte_length
+        # the caller already computed the aligned byte length of the
+        # new item; set pd_lower and pd_upper accordingly
+        new_header.pd_lower = _PD_LOWER_INITIAL
+        new_header.pd_upper = new_header.length - new_item_byte_length
 
         # adjust offset in the ItemIdData object
-        new_item_id.lp_off = new_page.header.pd_upper
+        new_item_id.lp_off = new_header.pd_upper
 
         # all is done! we can now insert ItemIdData and Item into the page
-        new_page.item_ids = [new_item_id]
-        new_page.items = [new_item]
-
         # append new page to the filenode
-        self.pages.append(new_page)
+        self.pages.append(
+            Page.from_parts(new_header, [new_item_id], [new_item]))
 
     def save_to_path(self, new_filenode_path):
-        filenode_bytes = b''.join(x.to_bytes() for x in self.pages)
-
-        with open(new_filenode_path, 'wb') as f:
-            f.write(filenode_bytes)
+        filenode_size = len(self._filenode_bytes)
+        n_original = len(self._page_offsets)
+        # stream pages into a temporary file next to the destination
+        # and swap it over the target once fully written; truncating
+        # the destination directly would fault the clean page copies
+        # below when saving over the still-mmapped source file
+        # the large write buffer coalesces the per-page writes into
+        # few syscalls
+        tmp_fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(new_filenode_path)))
+        try:
+            with open(tmp_fd, 'wb', buffering=1 << 20) as f:
+                for i in range(len(self.pages)):
+                    if i < n_original and i not in self._dirty_pages:
+                        # unmodified page; copy its original bytes
+                        # verbatim without parsing or re-serializing it
+                        page_start = self._page_offsets[i]
+                        page_end = self._page_offsets[i+1] \
+                            if i + 1 < n_original else filenode_size
+                        f.write(self._filenode_bytes[page_start:page_end])
+                    else:
+                        f.write(self.pages[i].to_bytes())
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        os.replace(tmp_path, new_filenode_path)
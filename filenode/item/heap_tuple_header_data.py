@@ -1,63 +1,130 @@
-import math
 import struct
 
 from filenode.page.item_pointer_data import ItemPointerData
 from .t_infomask import T_Infomask, T_Infomask2, HeapT_InfomaskFlags
 
+# precompiled unpackers for the common nullmap widths
+# struct.Struct is noticeably faster than int.from_bytes for small
+# fixed sizes; tables wider than 64 attributes fall back to
+# int.from_bytes
+_HEAP_TUPLE_HEADER_STRUCT = struct.Struct('<IIIHHHHHB')
+
+_NULLMAP_STRUCTS = {
+    1: struct.Struct('<B'),
+    2: struct.Struct('<H'),
+    4: struct.Struct('<I'),
+    8: struct.Struct('<Q'),
+}
+
 
 class HeapTupleHeaderData:
+    # no __dict__; one header is created per accessed tuple
+    __slots__ = ('t_xmin', 't_xmax', 't_cid', 't_xvac', 'bi_hi', 'bi_lo',
+                 'ip_posid', 't_infomask2', 't_infomask', 't_hoff',
+                 'nullmap_byte_size', 'nullmap')
+
     _FIELD_SIZE = 23
 
     def __init__(self, offset, filenode_bytes):
         # I do not account for DatumTupleFields here
         # https://github.com/postgres/postgres/blob/9d49837d7144e27ad8ea8918acb28f9872cb1585/src/include/access/htup_details.h#L134
-        self.t_xmin = struct.unpack('<I', filenode_bytes[offset:offset+4])[0]
-        self.t_xmax = struct.unpack('<I', filenode_bytes[offset+4:offset+8])[0]
+        # decode the whole 23 byte fixed part in a single struct call
+        # instead of one unpack plus bytes slice per field
+        # the t_ctid ItemPointerData fields are stored flat to avoid
+        # two object allocations per tuple; the wrapper object is only
+        # built on demand through the t_ctid property
+        (
+            self.t_xmin,
+            self.t_xmax,
+            self.t_cid,
+            self.bi_hi,
+            self.bi_lo,
+            self.ip_posid,
+            _t_infomask2,
+            _t_infomask,
+            self.t_hoff
+        ) = _HEAP_TUPLE_HEADER_STRUCT.unpack_from(filenode_bytes, offset)
 
         # fields can overlap
         # https://github.com/postgres/postgres/blob/9d49837d7144e27ad8ea8918acb28f9872cb1585/src/include/access/htup_details.h#L122
-        self.t_cid = struct.unpack('<I', filenode_bytes[offset+8:offset+12])[0]
         self.t_xvac = self.t_cid
 
-        self.t_ctid = ItemPointerData(filenode_bytes[offset+12:offset+18])
-
-        self.t_infomask2 = T_Infomask2(filenode_bytes[offset+18:offset+20])
-        self.t_infomask = T_Infomask(filenode_bytes[offset+20:offset+22])
-        self.t_hoff = struct.unpack(
-            'B', filenode_bytes[offset+22:offset+23])[0]
+        self.t_infomask2 = T_Infomask2.from_raw(_t_infomask2)
+        self.t_infomask = T_Infomask.from_raw(_t_infomask)
 
         self.nullmap_byte_size = 1
         self.nullmap = 0
 
         # if there is a null map, try to read it now
-        if HeapT_InfomaskFlags.HEAP_HASNULL in HeapT_InfomaskFlags(
-            self.t_infomask.flags
-        ):
+        if self.has_null:
             # null map has the bit size of the attribute number alligned
             # to bytes
-            self.nullmap_byte_size = math.ceil(self.t_infomask2.natts / 8)
-            self.nullmap = int.from_bytes(
-                filenode_bytes[offset+23:offset+23+self.nullmap_byte_size],
-                byteorder='little'
-            )
+            self.nullmap_byte_size = (self.t_infomask2.natts + 7) >> 3
+            _nullmap_struct = _NULLMAP_STRUCTS.get(self.nullmap_byte_size)
+            if _nullmap_struct:
+                self.nullmap = _nullmap_struct.unpack_from(
+                    filenode_bytes, offset+23)[0]
+            else:
+                self.nullmap = int.from_bytes(
+                    filenode_bytes[offset+23:offset+23+self.nullmap_byte_size],
+                    byteorder='little'
+                )
+
+    @property
+    def has_null(self):
+        # plain bitmask test; a property rather than a cached bool
+        # because serialization toggles HEAP_HASNULL on the header
+        return bool(
+            self.t_infomask.flags & HeapT_InfomaskFlags.HEAP_HASNULL.value)
+
+    @property
+    def total_header_size(self):
+        # fixed part plus the (padded) nullmap that follows it
+        return self._FIELD_SIZE + self.nullmap_byte_size
+
+    @property
+    def t_ctid(self):
+        return ItemPointerData.from_fields(
+            self.bi_hi, self.bi_lo, self.ip_posid)
+
+    def clone(self):
+        header = self.__class__.__new__(self.__class__)
+        header.t_xmin = self.t_xmin
+        header.t_xmax = self.t_xmax
+        header.t_cid = self.t_cid
+        header.t_xvac = self.t_xvac
+        header.bi_hi = self.bi_hi
+        header.bi_lo = self.bi_lo
+        header.ip_posid = self.ip_posid
+        header.t_infomask2 = self.t_infomask2.clone()
+        header.t_infomask = self.t_infomask.clone()
+        header.t_hoff = self.t_hoff
+        header.nullmap_byte_size = self.nullmap_byte_size
+        header.nullmap = self.nullmap
+        return header
 
     def to_bytes(self):
-        heap_tuple_header_bytes = b''
-        heap_tuple_header_bytes += struct.pack('<I', self.t_xmin)
-        heap_tuple_header_bytes += struct.pack('<I', self.t_xmax)
-        heap_tuple_header_bytes += struct.pack('<I', self.t_cid)
-        heap_tuple_header_bytes += self.t_ctid.to_bytes()
-        heap_tuple_header_bytes += self.t_infomask2.to_bytes()
-        heap_tuple_header_bytes += self.t_infomask.to_bytes()
-        heap_tuple_header_bytes += struct.pack('B', self.t_hoff)
-
-        # for some reason this fails without explicit typecast in
-        # HeapT_InfomaskFlags enum object
-        if HeapT_InfomaskFlags.HEAP_HASNULL in HeapT_InfomaskFlags(
-            self.t_infomask.flags
-        ):
-            heap_tuple_header_bytes += self.nullmap.to_bytes(
-                self.nullmap_byte_size, byteorder='little')
+        # pack the whole 23 byte fixed part in a single precompiled
+        # struct call
+        heap_tuple_header_bytes = _HEAP_TUPLE_HEADER_STRUCT.pack(
+            self.t_xmin,
+            self.t_xmax,
+            self.t_cid,
+            self.bi_hi,
+            self.bi_lo,
+            self.ip_posid,
+            self.t_infomask2.natts | self.t_infomask2.flags,
+            self.t_infomask.flags,
+            self.t_hoff
+        )
+
+        if self.has_null:
+            _nullmap_struct = _NULLMAP_STRUCTS.get(self.nullmap_byte_size)
+            if _nullmap_struct:
+                heap_tuple_header_bytes += _nullmap_struct.pack(self.nullmap)
+            else:
+                heap_tuple_header_bytes += self.nullmap.to_bytes(
+                    self.nullmap_byte_size, byteorder='little')
         else:
             heap_tuple_header_bytes += b'\x00'
 
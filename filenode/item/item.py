@@ -2,14 +2,54 @@ from .heap_tuple_header_data import HeapTupleHeaderData
 
 
 class Item:
+    # no __dict__; one item is created per accessed row
+    __slots__ = ('header', '_filenode_bytes', '_data_offset',
+                 '_data_length', '_data')
+
     def __init__(self, offset, length, filenode_bytes):
         self.header = HeapTupleHeaderData(offset, filenode_bytes)
-        self.data = filenode_bytes[offset+self.header.t_hoff:offset+length]
+        # keep an (offset, length) reference into the zero-copy filenode
+        # buffer instead of slicing the payload out eagerly; unchanged
+        # items never pay for the copy
+        self._filenode_bytes = filenode_bytes
+        self._data_offset = offset + self.header.t_hoff
+        self._data_length = length - self.header.t_hoff
+        self._data = None
 
-    def to_bytes(self):
-        item_bytes = b''
-        item_bytes += self.header.to_bytes()
-        item_bytes += bytes(self.header.t_hoff - len(self.header.to_bytes()))
-        item_bytes += self.data
+    @property
+    def data(self):
+        # materialize the payload bytes on first access and cache them
+        if self._data is None:
+            self._data = bytes(
+                self._filenode_bytes[
+                    self._data_offset:self._data_offset+self._data_length])
+        return self._data
+
+    @data.setter
+    def data(self, new_data):
+        self._data = new_data
 
-        return item_bytes
+    def clone(self):
+        # data is an immutable bytes object, so aliasing it is safe
+        item = self.__class__.__new__(self.__class__)
+        item.header = self.header.clone()
+        item._filenode_bytes = self._filenode_bytes
+        item._data_offset = self._data_offset
+        item._data_length = self._data_length
+        item._data = self._data
+        return item
+
+    def byte_length(self):
+        # serialized length without materializing the buffer: the data
+        # always starts at t_hoff
+        return self.header.t_hoff + len(self.data)
+
+    def to_bytes(self):
+        header_bytes = self.header.to_bytes()
+        # join the parts in one pass instead of growing a bytes
+        # accumulator with repeated concatenation
+        return b''.join([
+            header_bytes,
+            bytes(self.header.t_hoff - len(header_bytes)),
+            self.data
+        ])
@@ -34,9 +34,24 @@ class T_Infomask:
                       HeapT_InfomaskFlags.HEAP_XMAX_KEYSHR_LOCK).value
 
     def __init__(self, t_infomask_bytes):
-        self.flags = HeapT_InfomaskFlags(
-            struct.unpack('<H', t_infomask_bytes)[0]
-        )
+        # flags is kept as the raw uint16; wrapping it in
+        # HeapT_InfomaskFlags on every parsed tuple costs an IntFlag
+        # construction per item, and callers that need the enum view
+        # can build it from the int on demand
+        self.flags = struct.unpack('<H', t_infomask_bytes)[0]
+
+    @classmethod
+    def from_raw(cls, t_infomask):
+        # build from the already unpacked uint16, skipping the
+        # per-field bytes slice and unpack
+        infomask = cls.__new__(cls)
+        infomask.flags = t_infomask
+        return infomask
+
+    def clone(self):
+        t_infomask = self.__class__.__new__(self.__class__)
+        t_infomask.flags = self.flags
+        return t_infomask
 
     def to_bytes(self):
         return struct.pack('<H', self.flags)
@@ -52,7 +67,21 @@ class T_Infomask2:
         # get number of attributes in the item
         self.natts = _t_infomask_2 & self.HEAP_NATTS_MASK
 
-        self.flags = HeapT_Infomask2Flags(_t_infomask_2 & self.HEAP_FLAGS_MASK)
+        # raw uint16 flag bits, same reasoning as T_Infomask.flags
+        self.flags = _t_infomask_2 & self.HEAP_FLAGS_MASK
+
+    @classmethod
+    def from_raw(cls, t_infomask2):
+        infomask2 = cls.__new__(cls)
+        infomask2.natts = t_infomask2 & cls.HEAP_NATTS_MASK
+        infomask2.flags = t_infomask2 & cls.HEAP_FLAGS_MASK
+        return infomask2
+
+    def clone(self):
+        t_infomask2 = self.__class__.__new__(self.__class__)
+        t_infomask2.natts = self.natts
+        t_infomask2.flags = self.flags
+        return t_infomask2
 
     def to_bytes(self):
         return struct.pack('<H', self.natts | self.flags)
@@ -2,15 +2,26 @@ import struct
 
 
 class BlockIdData:
+    __slots__ = ('bi_hi', 'bi_lo')
+
     _FIELD_SIZE = 4
 
     def __init__(self, block_data_bytes):
         self.bi_hi = struct.unpack('<H', block_data_bytes[:2])[0]
         self.bi_lo = struct.unpack('<H', block_data_bytes[2:4])[0]
 
-    def to_bytes(self):
-        block_data_bytes = b''
-        block_data_bytes += struct.pack('<H', self.bi_hi)
-        block_data_bytes += struct.pack('<H', self.bi_lo)
+    @classmethod
+    def from_fields(cls, bi_hi, bi_lo):
+        block_id = cls.__new__(cls)
+        block_id.bi_hi = bi_hi
+        block_id.bi_lo = bi_lo
+        return block_id
 
-        return block_data_bytes
+    def clone(self):
+        block_id = self.__class__.__new__(self.__class__)
+        block_id.bi_hi = self.bi_hi
+        block_id.bi_lo = self.bi_lo
+        return block_id
+
+    def to_bytes(self):
+        return struct.pack('<HH', self.bi_hi, self.bi_lo)
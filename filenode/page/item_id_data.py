@@ -9,17 +9,50 @@ class LpFlags(Enum):
     LP_DEAD = 0x3
 
 
+_ITEM_ID_STRUCT = struct.Struct('<I')
+
+# Enum.__call__ is surprisingly slow; a plain dict lookup avoids it in
+# the per-pointer parse path
+_LP_FLAGS_MAP = {x.value: x for x in LpFlags}
+
+
 class ItemIdData:
+    # no __dict__; one pointer is created per accessed line pointer
+    __slots__ = ('lp_off', 'lp_flags', 'lp_len')
+
     _FIELD_SIZE = 4
 
     def __init__(self, item_id_bytes):
-        _encoded_data = struct.unpack('<I', item_id_bytes)[0]
+        self._parse(_ITEM_ID_STRUCT.unpack(item_id_bytes)[0])
+
+    @classmethod
+    def from_raw(cls, encoded_data):
+        item_id = cls.__new__(cls)
+        item_id._parse(encoded_data)
+        return item_id
+
+    @classmethod
+    def parse_many(cls, items_id_data):
+        # bulk-decode the whole line pointer block with one precompiled
+        # struct iterator instead of slicing 4 bytes per pointer
+        return LazyItemIdList(
+            [raw for (raw,) in _ITEM_ID_STRUCT.iter_unpack(items_id_data)])
+
+    def _parse(self, _encoded_data):
         # lower 15 bits store the item offset
         self.lp_off = _encoded_data & 0x7fff
         # middle 2 bits store the item flags
-        self.lp_flags = LpFlags((_encoded_data & 0x18000) >> 15)
+        self.lp_flags = _LP_FLAGS_MAP[(_encoded_data >> 15) & 0x3]
         # upper 15 bits store the item length
-        self.lp_len = (_encoded_data & 0xfffe0000) >> 17
+        self.lp_len = _encoded_data >> 17
+
+    def clone(self):
+        # purpose-built shallow copy; much cheaper than copy.deepcopy
+        item_id = self.__class__.__new__(self.__class__)
+        item_id.lp_off = self.lp_off
+        item_id.lp_flags = self.lp_flags
+        item_id.lp_len = self.lp_len
+        return item_id
 
     def to_bytes(self):
         item_id = 0
@@ -30,3 +63,39 @@ class ItemIdData:
         # lower 15 bits store the item offset
         item_id = item_id | self.lp_off
         return struct.pack('<I', item_id)
+
+
+class LazyItemIdList:
+    # list-like container over the raw uint32 line pointers; during
+    # parsing only the ints are kept (one int instead of a full Python
+    # object per pointer), and ItemIdData objects are materialized for
+    # the pointers actually accessed
+    def __init__(self, raw_item_ids):
+        self._raw = raw_item_ids
+        self._item_ids = dict()
+        self._extra = list()
+
+    def __len__(self):
+        return len(self._raw) + len(self._extra)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('item id index out of range')
+        if index >= len(self._raw):
+            return self._extra[index - len(self._raw)]
+        # materialize the object on first access and cache it, so that
+        # edits through the cached instance stick
+        item_id = self._item_ids.get(index)
+        if item_id is None:
+            item_id = ItemIdData.from_raw(self._raw[index])
+            self._item_ids[index] = item_id
+        return item_id
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, item_id):
+        self._extra.append(item_id)
@@ -4,15 +4,27 @@ from .block_id_data import BlockIdData
 
 
 class ItemPointerData:
+    __slots__ = ('ip_blkid', 'ip_posid')
+
     _FIELD_SIZE = 6
 
     def __init__(self, item_pointer_bytes):
         self.ip_blkid = BlockIdData(item_pointer_bytes[:4])
         self.ip_posid = struct.unpack('<H', item_pointer_bytes[4:6])[0]
 
-    def to_bytes(self):
-        item_pointer_bytes = b''
-        item_pointer_bytes += self.ip_blkid.to_bytes()
-        item_pointer_bytes += struct.pack('<H', self.ip_posid)
+    @classmethod
+    def from_fields(cls, bi_hi, bi_lo, ip_posid):
+        item_pointer = cls.__new__(cls)
+        item_pointer.ip_blkid = BlockIdData.from_fields(bi_hi, bi_lo)
+        item_pointer.ip_posid = ip_posid
+        return item_pointer
 
-        return item_pointer_bytes
+    def clone(self):
+        item_pointer = self.__class__.__new__(self.__class__)
+        item_pointer.ip_blkid = self.ip_blkid.clone()
+        item_pointer.ip_posid = self.ip_posid
+        return item_pointer
+
+    def to_bytes(self):
+        return struct.pack(
+            '<HHH', self.ip_blkid.bi_hi, self.ip_blkid.bi_lo, self.ip_posid)
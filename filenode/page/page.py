@@ -1,15 +1,59 @@
-import math
 from .page_header_data import PageHeaderData
 from .item_id_data import ItemIdData
 from filenode.item import Item
 
 
+class LazyItemList:
+    # list-like container that defers Item construction until an item
+    # is actually accessed
+    # list_pages only needs the page headers and read_item touches a
+    # single item, so parsing every HeapTupleHeaderData up front is
+    # wasted work on large pages
+    def __init__(self, filenode_bytes, offset, item_ids):
+        self._filenode_bytes = filenode_bytes
+        self._offset = offset
+        self._item_ids = item_ids
+        # number of items backed by the raw page bytes; items appended
+        # later live in self._extra and are never parsed from the buffer
+        self._parsed_count = len(item_ids)
+        self._items = dict()
+        self._extra = list()
+
+    def __len__(self):
+        return self._parsed_count + len(self._extra)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('item index out of range')
+        if index >= self._parsed_count:
+            return self._extra[index - self._parsed_count]
+        # parse the item on first access and cache the object, so that
+        # edits through the cached instance stick
+        item = self._items.get(index)
+        if item is None:
+            item_id = self._item_ids[index]
+            item = Item(self._offset + item_id.lp_off, item_id.lp_len,
+                        self._filenode_bytes)
+            self._items[index] = item
+        return item
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, item):
+        self._extra.append(item)
+
+
 class Page:
+    __slots__ = ('offset', 'header', 'item_ids', 'items')
+
     def __init__(self, filenode_bytes, offset):
         self.offset = offset
         # parse page header
-        self.header = PageHeaderData(
-            filenode_bytes[offset:offset+PageHeaderData._FIELD_SIZE])
+        self.header = PageHeaderData(filenode_bytes, offset)
         # parse page entries
         # pointers to page entries are stored in the ItemIdData
         # objects between the header and the pd_lower offsets
@@ -21,40 +65,49 @@ class Page:
             PageHeaderData._FIELD_SIZE:offset +
             self.header.pd_lower
         ]
-        self.item_ids = [ItemIdData(items_id_data[i:i+4])
-                         for i in range(0, len(items_id_data), 4)]
-        # iterate over item ids, populate actual items (i.e. rows) in the page
+        self.item_ids = ItemIdData.parse_many(items_id_data)
+        # item ids point at the actual items (i.e. rows) in the page
         # item_id.lp_off will point to the HeapTupleHeaderData object of the
         # actual item we will need to parse this object to obtain information
         # about the item and an offset to the actual data
-        # read HeapTupleHeaderData object
-        self.items = [Item(offset+x.lp_off, x.lp_len, filenode_bytes)
-                      for x in self.item_ids]
+        # items are parsed lazily on first access
+        self.items = LazyItemList(filenode_bytes, offset, self.item_ids)
+
+    @classmethod
+    def from_parts(cls, header, item_ids, items, offset=0):
+        # assemble a page from already built components without going
+        # through the buffer parse in __init__
+        page = cls.__new__(cls)
+        page.offset = offset
+        page.header = header
+        page.item_ids = item_ids
+        page.items = items
+        return page
 
     def to_bytes(self):
-        page_bytes = b''
+        # serialize into a single pre-zeroed buffer of the exact page
+        # length; the zero initialization provides the empty space and
+        # alignment padding for free, and writing in place avoids the
+        # repeated bytes concatenation of the old implementation
+        page_bytes = bytearray(self.header.length)
         # pack page header
-        page_bytes += self.header.to_bytes()
+        page_bytes[:PageHeaderData._FIELD_SIZE] = self.header.to_bytes()
         # pack ItemIdData pointers
-        page_bytes += b''.join(x.to_bytes() for x in self.item_ids)
-        # pad empty space with null bytes
-        # empty space starts at the end of ItemItData pointers
-        # indicated by header.pd_lower value
-        # and ends at the start of the item entries
-        # indicated by header.pd_upper value
-        page_bytes += bytes(self.header.pd_upper - self.header.pd_lower)
-        # pack page items
+        # they sit between the header and the pd_lower offset
+        write_pos = PageHeaderData._FIELD_SIZE
+        for item_id in self.item_ids:
+            page_bytes[write_pos:write_pos+ItemIdData._FIELD_SIZE] = \
+                item_id.to_bytes()
+            write_pos += ItemIdData._FIELD_SIZE
+        # pack page items starting at the pd_upper offset
         # items must be reversed in order
-        items_rev = list(reversed(self.items))
-        for i in range(len(items_rev)):
-            item_bytes = items_rev[i].to_bytes()
-            page_bytes += item_bytes
-            # pad the item with null bytes at the end to match
-            # the 8 byte data allignment scheme
-            page_bytes += bytes((math.ceil(len(item_bytes) / 8)
-                                * 8) - len(item_bytes))
-
-        # pad anything that's left with null bytes to match page length
-        page_bytes += bytes(self.header.length - len(page_bytes))
-
-        return page_bytes
+        write_pos = self.header.pd_upper
+        for item in reversed(self.items):
+            item_bytes = item.to_bytes()
+            page_bytes[write_pos:write_pos+len(item_bytes)] = item_bytes
+            # item starts are aligned to the 8 byte data allignment
+            # scheme; round up with integer bit math instead of
+            # going through float division and math.ceil
+            write_pos += (len(item_bytes) + 7) & ~7
+
+        return bytes(page_bytes)
@@ -17,42 +17,72 @@ class PdPageVersion(Enum):
     POSTGRES_83_PLUS = 0x4
 
 
-class PageHeaderData:
-    _FIELD_SIZE = 24
+# precompiled struct covering the whole 24 byte page header
+_PAGE_HEADER_STRUCT = struct.Struct('<QHHHHHHI')
 
-    def __init__(self, header_bytes):
-        # parse raw header bytes
-        self.pd_lsn = struct.unpack('<Q', header_bytes[:8])[0]
-        self.checksum = struct.unpack('<H', header_bytes[8:10])[0]
+# Enum.__call__ is surprisingly slow; a plain dict lookup avoids it in
+# the per-page parse path
+_PD_PAGE_VERSION_MAP = {x.value: x for x in PdPageVersion}
 
-        self.pd_flags = PdFlags(
-            struct.unpack('<H', header_bytes[10:12])[0]
-        )
 
-        self.pd_lower = struct.unpack('<H', header_bytes[12:14])[0]
-        self.pd_upper = struct.unpack('<H', header_bytes[14:16])[0]
-        self.pd_special = struct.unpack('<H', header_bytes[16:18])[0]
+class PageHeaderData:
+    # no __dict__; one header is created per parsed page
+    __slots__ = ('pd_lsn', 'checksum', 'pd_flags', 'pd_lower', 'pd_upper',
+                 'pd_special', 'size', 'length', 'version', 'pd_prune_xid')
 
-        _pd_pagesize_version = struct.unpack('<H', header_bytes[18:20])[0]
+    _FIELD_SIZE = 24
+
+    def __init__(self, filenode_bytes, offset=0):
+        # parse all raw header fields in a single struct call instead
+        # of one unpack plus byte slice per field
+        (
+            self.pd_lsn,
+            self.checksum,
+            _pd_flags,
+            self.pd_lower,
+            self.pd_upper,
+            self.pd_special,
+            _pd_pagesize_version,
+            self.pd_prune_xid
+        ) = _PAGE_HEADER_STRUCT.unpack_from(filenode_bytes, offset)
+
+        # pd_flags is kept as a raw bitmask; constructing a PdFlags
+        # member per page is pure allocation churn, the int is enough
+        # to test and pack the flags
+        self.pd_flags = _pd_flags
         # parse pd_pagesize_version
         self.size = self.length = _pd_pagesize_version & 0xFF00
-        self.version = PdPageVersion(_pd_pagesize_version & 0x00FF)
+        self.version = _PD_PAGE_VERSION_MAP[_pd_pagesize_version & 0x00FF]
 
-        self.pd_prune_xid = struct.unpack('<I', header_bytes[20:24])[0]
+    def clone(self):
+        # purpose-built copy, same pattern as the other on-disk structs
+        header = self.__class__.__new__(self.__class__)
+        header.pd_lsn = self.pd_lsn
+        header.checksum = self.checksum
+        header.pd_flags = self.pd_flags
+        header.pd_lower = self.pd_lower
+        header.pd_upper = self.pd_upper
+        header.pd_special = self.pd_special
+        header.size = self.size
+        header.length = self.length
+        header.version = self.version
+        header.pd_prune_xid = self.pd_prune_xid
+        return header
+
+    def has_flag(self, flag):
+        return bool(self.pd_flags & flag.value)
 
     def to_bytes(self):
-        header_bytes = b''
-
-        header_bytes += struct.pack('<Q', self.pd_lsn)
-        # zero out checksum, just to be super safe with editing data
-        header_bytes += struct.pack('<H', 0)
-        # pack pd_flags into 32 bit integer via bitwise or
-        header_bytes += struct.pack('<H', self.pd_flags.value)
-        header_bytes += struct.pack('<H', self.pd_lower)
-        header_bytes += struct.pack('<H', self.pd_upper)
-        header_bytes += struct.pack('<H', self.pd_special)
-        # pack pd_pagesize_version
-        header_bytes += struct.pack('<H', self.size | self.version.value)
-        header_bytes += struct.pack('<I', self.pd_prune_xid)
-
-        return header_bytes
+        # pack the whole header in a single precompiled struct call
+        # checksum is zeroed out, just to be super safe with editing
+        # data
+        return _PAGE_HEADER_STRUCT.pack(
+            self.pd_lsn,
+            0,
+            self.pd_flags,
+            self.pd_lower,
+            self.pd_upper,
+            self.pd_special,
+            self.size | self.version.value,
+            self.pd_prune_xid
+        )
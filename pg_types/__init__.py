@@ -1,22 +1,5 @@
 from .varlena import Varlena_1B, Varlena_4B
-from .datatype import DataType, DataTypeRaw
+from .datatype import DataType, DataTypeRaw, PARSEABLE_TYPES
 
-PARSEABLE_TYPES = [
-    'oid',
-    'int',
-    'int2',
-    'int4',
-    'int8',
-    'bool',
-    'date',
-    'timetz',
-    'timestamptz',
-    'time',
-    'timestamp',
-    'serial',
-    'serial2',
-    'serial4',
-    'serial8'
-]
-
-__all__ = ['Varlena_1B', 'Varlena_4B', 'DataType', 'DataTypeRaw']
+__all__ = ['Varlena_1B', 'Varlena_4B', 'DataType', 'DataTypeRaw',
+           'PARSEABLE_TYPES']
@@ -1,4 +1,24 @@
 import csv
+import struct
+
+# frozenset for O(1) membership tests in the per-field hot loops
+PARSEABLE_TYPES = frozenset([
+    'oid',
+    'int',
+    'int2',
+    'int4',
+    'int8',
+    'bool',
+    'date',
+    'timetz',
+    'timestamptz',
+    'time',
+    'timestamp',
+    'serial',
+    'serial2',
+    'serial4',
+    'serial8'
+])
 
 
 class DataType:
@@ -11,19 +31,54 @@ class DataType:
         'd': 'q',  # DOUBLE
     }
 
+    _PY_TYPE_SIZES = {
+        'b': 1,
+        'h': 2,
+        'i': 4,
+        'q': 8,
+    }
+
     def __init__(self, csv_str):
         self.field_defs = list()
 
         for field_def in csv.reader(csv_str.split(';')):
             name, _type, _length, _alignment = field_def
             if name not in self._INTERNAL_ATTRS:
+                alignment = self._PG_TO_PY_TYPE_MAPPING[_alignment]
                 self.field_defs.append({
                     'name': name,
                     'type': _type,
                     'length': int(_length),
-                    'alignment': self._PG_TO_PY_TYPE_MAPPING[_alignment]
+                    'alignment': alignment,
+                    # precompiled unpacker for parseable fixed length
+                    # fields, bound once at schema-bind time
+                    '_struct': struct.Struct('<' + alignment)
+                    if _type in PARSEABLE_TYPES else None
                 })
 
+        # if the whole row can be decoded in a single struct call,
+        # precompile the row format once at schema-bind time instead of
+        # re-interpreting the field defs for every item
+        self._fast_struct = self._build_fast_struct()
+
+    def _build_fast_struct(self):
+        # a single-struct row decode is only possible when every field
+        # is a parseable fixed length type and no alignment padding is
+        # needed between the columns
+        fmt = '<'
+        offset = 0
+        for field_def in self.field_defs:
+            size = self._PY_TYPE_SIZES[field_def['alignment']]
+            if any([
+                field_def['type'] not in PARSEABLE_TYPES,
+                field_def['length'] != size,
+                offset % size != 0
+            ]):
+                return None
+            fmt += field_def['alignment']
+            offset += size
+        return struct.Struct(fmt)
+
     def _field_no_padding(self, field_def):
         return any([
             field_def['alignment'] == 'b',
@@ -38,9 +93,11 @@ class DataType:
 
 class DataTypeRaw(DataType):
     def __init__(self):
+        self._fast_struct = None
         self.field_defs = [{
             'name': 'raw_data',
             'type': '',
             'length': '',
-            'alignment': ''
+            'alignment': '',
+            '_struct': None
         }]
@@ -1,23 +1,44 @@
+import struct
+
+
 class Varlena:
     _VA_DEFAULT_HEADER = 0
     _VA_HEADER_SIZE = 0
     _VA_MAX_DATA_SIZE = 0
     _VA_SIZE_SHIFT = 0
     _VA_SIZE_MASK = 0
+    _VA_HEADER_STRUCT = None
 
     def __init__(self, raw_bytes=None):
+        # serialized form of the varlena; invalidated on mutation and
+        # rebuilt by to_bytes on demand
+        self.__cached_bytes = None
         if raw_bytes:
-            self.__va_header = int.from_bytes(
-                raw_bytes[:self._VA_HEADER_SIZE], 'big')
-            self.value = raw_bytes[self._VA_HEADER_SIZE:self.size]
+            self.__va_header = self._VA_HEADER_STRUCT.unpack_from(
+                raw_bytes)[0]
+            # decode the size once; the property below serves the
+            # cached value on every subsequent access
+            self.__size = (self.__va_header >> self._VA_SIZE_SHIFT) \
+                & self._VA_SIZE_MASK
+            self.value = raw_bytes[self._VA_HEADER_SIZE:self.__size]
         else:
             # Set va_header ID of Varlena object
             self.__va_header = self._VA_DEFAULT_HEADER
+            self.__size = 0
             self.value = b''
 
+    @property
+    def value(self):
+        return self.__value
+
+    @value.setter
+    def value(self, new_value):
+        self.__value = new_value
+        self.__cached_bytes = None
+
     @property
     def size(self):
-        return (self.__va_header >> self._VA_SIZE_SHIFT) & self._VA_SIZE_MASK
+        return self.__size
 
     @size.setter
     def size(self, new_size):
@@ -28,17 +49,20 @@ class Varlena:
         # account for the size of va_header by adding extra 1 byte
         self.__va_header |= ((new_size + self._VA_HEADER_SIZE)
                              & self._VA_SIZE_MASK) << self._VA_SIZE_SHIFT
+        # keep the cached size in sync with the header
+        self.__size = (self.__va_header >> self._VA_SIZE_SHIFT) \
+            & self._VA_SIZE_MASK
+        self.__cached_bytes = None
 
     def set_value(self, new_value):
         self.size = len(new_value)
         self.value = new_value
 
     def to_bytes(self):
-        return int.to_bytes(
-            self.__va_header,
-            length=self._VA_HEADER_SIZE,
-            byteorder='little'
-        ) + self.value
+        if self.__cached_bytes is None:
+            self.__cached_bytes = self._VA_HEADER_STRUCT.pack(
+                self.__va_header) + self.value
+        return self.__cached_bytes
 
 
 class Varlena_1B(Varlena):
@@ -47,6 +71,7 @@ class Varlena_1B(Varlena):
     _VA_MAX_DATA_SIZE = 0x7E
     _VA_SIZE_SHIFT = 1
     _VA_SIZE_MASK = 0x7F
+    _VA_HEADER_STRUCT = struct.Struct('B')
 
 
 class Varlena_4B(Varlena):
@@ -55,3 +80,4 @@ class Varlena_4B(Varlena):
     _VA_MAX_DATA_SIZE = 0x40000000
     _VA_SIZE_SHIFT = 2
     _VA_SIZE_MASK = 0x3FFFFFFF
+    _VA_HEADER_STRUCT = struct.Struct('<I')
@@ -5,7 +5,7 @@ import tempfile
 from io import StringIO
 from base64 import b64encode
 from filenode import Filenode
-from pg_types import DataType
+from pg_types import DataType, Varlena_4B
 
 FILENODE_PATH = './tests/sample_filenodes'
 
@@ -16,6 +16,9 @@ sample_filenodes = [
         'payload_dt_inline': '1,42,Test,Test@test.com,Testpass123,Test Address,42,1',
         'payload_dt_null': '1,NULL,Test,NULL,Testpass123,Test Address,42,NULL',
         'payload_dt_long': '1,42,SuperLongStringAAAAAAAAA,SuperLongStringAAAAAAAAAAAAAAA,SuperLongStringAAAAAAAAAAAAAAA,SuperLongStringAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA,42,1',
+        # address is longer than the 1 byte varlena limit of 126 bytes,
+        # forcing the Varlena_4B serialization path
+        'payload_dt_huge': '1,42,Test,Test@test.com,Testpass123,' + 'A' * 300 + ',42,1',
         'payload_raw': b'\x01\x00\x00\x00\x42\x42\x42\x42\rTest1!test1@test1.com\x1btest1pass123\x69Suite 491 22979 Veum Grove, Gorczanymouth, NH 12345\x00\x42\x00\x00\x00\x01'
     },
     {
@@ -24,6 +27,9 @@ sample_filenodes = [
         'payload_dt_inline': '42,Test,43,Test1',
         'payload_dt_null': '42,Test1,43,NULL',
         'payload_dt_long': '42,Test1,43,super loooooooooooooong string',
+        # city is longer than the 1 byte varlena limit of 126 bytes,
+        # forcing the Varlena_4B serialization path
+        'payload_dt_huge': '42,Test1,43,' + 'B' * 200,
         'payload_raw': b'\x42\x00\x00\x00\x0cTest1\x00\x00\x00\x43\x00\x00\x00\x0bTest'
     }
 ]
@@ -239,6 +245,43 @@ def test_update_datatype_new_item():
         assert sample_filenode['payload_dt_long'] == ','.join(updated_values)
 
 
+def test_update_datatype_huge_varlena():
+    for sample_filenode in sample_filenodes:
+        csv_payload = list(csv.reader(
+            StringIO(sample_filenode['payload_dt_huge'])))[0]
+
+        datatype = DataType(sample_filenode['datatype'])
+
+        filenode_path = pathlib.Path(FILENODE_PATH, sample_filenode['name'])
+        filenode_new_path = pathlib.Path(
+            tempfile.gettempdir(),
+            sample_filenode['name']
+        ).with_suffix('.new')
+
+        filenode = Filenode(filenode_path, datatype=datatype)
+        # update item in last page
+        last_page = len(filenode.pages) - 1
+
+        filenode.update_item(last_page, 0, csv_payload)
+        filenode.save_to_path(filenode_new_path)
+
+        filenode = Filenode(filenode_new_path, datatype=datatype)
+        # read item from the last page
+        last_page = len(filenode.pages) - 1
+
+        updated_values = list()
+        # new item be the last in the page
+        for field in filenode.read_item(last_page, len(filenode.pages[last_page].items) - 1):
+            value = field['value']
+            if isinstance(value, bytes):
+                value = value.decode()
+            else:
+                value = str(value)
+            updated_values.append(value)
+
+        assert sample_filenode['payload_dt_huge'] == ','.join(updated_values)
+
+
 def test_update_datatype_new_page():
     # test 40996 only
     sample_filenode = sample_filenodes[0]
@@ -276,3 +319,18 @@ def test_update_datatype_new_page():
         updated_values.append(value)
 
     assert sample_filenode['payload_dt_long'] == ','.join(updated_values)
+
+
+def test_varlena_4b_header_little_endian():
+    varlena = Varlena_4B()
+    varlena.set_value(b'C' * 300)
+
+    varlena_bytes = varlena.to_bytes()
+    # uncompressed 4B varlenas store (size << 2) as a little-endian
+    # uint32, where size includes the 4 byte header itself
+    assert varlena_bytes[:4] == ((300 + 4) << 2).to_bytes(4, 'little')
+
+    # the parser must decode the same header byte order it writes
+    varlena = Varlena_4B(varlena_bytes)
+    assert varlena.size == 300 + 4
+    assert varlena.value == b'C' * 300